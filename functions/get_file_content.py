@@ -1,18 +1,88 @@
+import codecs
+import io
+import mmap
 import os
+import stat
+from collections import OrderedDict
 # FIX: Use relative import (from .config) since config.py is a sibling file 
 # inside the 'functions' package.
 from .config import MAX_READ_LENGTH
+from .paths import _is_within, _join_path, _realpath_cached
 
 # Use the imported constant
 MAX_FILE_CHARS = MAX_READ_LENGTH
 
-def get_file_content(working_directory, file_path):
+# Files above this size are memory-mapped so only the prefix we return is paged in.
+MMAP_THRESHOLD = 64 * 1024
+
+# LRU of recent reads: abs_path -> (stat key, content, truncated). An entry is only
+# reused while the file's inode, size, mtime and ctime are all unchanged; ctime
+# cannot be set from user space, so it catches rewrites that restore the old mtime
+# (cp -p, touch -r, rsync -t) as well as permission changes.
+_FILE_CACHE_MAXSIZE = 64
+_FILE_CACHE = OrderedDict()
+
+
+def _stat_key(st):
+    """Fields of a stat result that must match for a cached read to be reused."""
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def _evict_cached_content(abs_file_path):
+    """Drop any cached read of abs_file_path (used by write_file after writing)."""
+    _FILE_CACHE.pop(abs_file_path, None)
+
+
+def _decode_prefix(data, final=False):
+    """
+    Decode a UTF-8 byte prefix the same way text-mode open() would.
+
+    The prefix may end mid-codepoint (or between \r and \n), so the trailing
+    partial sequence is held back instead of raising; invalid bytes elsewhere
+    still raise UnicodeDecodeError. Pass final=True when data is the whole file.
+    """
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    return decoder.decode(data, final=final)
+
+
+def _read_prefix(abs_file_path):
+    """
+    Read at most MAX_FILE_CHARS characters from abs_file_path.
+
+    Returns (content, truncated, st), where content is already cut to MAX_FILE_CHARS
+    and st is the stat result of the file that was actually read.
+    """
+    fd = os.open(abs_file_path, os.O_RDONLY)
+    try:
+        st = os.fstat(fd)
+        size = st.st_size
+        if size <= MMAP_THRESHOLD:
+            # Reading one character past the limit is enough to detect truncation.
+            with open(fd, 'r', encoding='utf-8', closefd=False) as f:
+                content = f.read(MAX_FILE_CHARS + 1)
+            truncated = len(content) > MAX_FILE_CHARS
+        else:
+            # A UTF-8 character is at most 4 bytes, so this window always covers
+            # MAX_FILE_CHARS characters without touching the rest of the file.
+            window = min(size, MAX_FILE_CHARS * 4)
+            with mmap.mmap(fd, window, access=mmap.ACCESS_READ) as mm:
+                content = _decode_prefix(mm[:window], final=window == size)
+            truncated = window < size or len(content) > MAX_FILE_CHARS
+    finally:
+        os.close(fd)
+
+    return content[:MAX_FILE_CHARS], truncated, st
+
+
+def get_file_content(working_directory, file_path, *, _skip_resolve=False):
     """
     Reads the content of a specific file, enforcing security checks and truncation.
 
     Args:
         working_directory (str): The permitted root directory for file access.
         file_path (str): The relative or absolute path to the file to read.
+        _skip_resolve (bool): Internal. Set when working_directory is already a
+            realpath (as produced by tool_registry), so it is not resolved again.
 
     Returns:
         str: The content of the file, or an error message if reading fails.
@@ -20,32 +90,44 @@ def get_file_content(working_directory, file_path):
     try:
         # 1. Combine working_directory and file_path to get the intended full path
         # This ensures 'lorem.txt' is correctly found inside the 'calculator' directory.
-        intended_full_path = os.path.join(working_directory, file_path)
+        intended_full_path = _join_path(working_directory, file_path)
 
         # 2. Normalize paths to handle relative paths and symlinks securely
         # realpath resolves symbolic links and normalizes the path.
-        abs_working_dir = os.path.realpath(working_directory)
+        if _skip_resolve:
+            abs_working_dir = working_directory
+        else:
+            abs_working_dir = _realpath_cached(os.path.abspath(working_directory))
         # Use the combined path for the absolute file path resolution
         abs_file_path = os.path.realpath(intended_full_path) 
 
         # 3. Security Check: Ensure file_path is within working_directory
-        # If the file path is outside the working directory, the common path will be shorter.
-        if not os.path.commonpath([abs_working_dir, abs_file_path]) == abs_working_dir:
+        if not _is_within(abs_file_path, abs_working_dir):
             return f'Error: Cannot read "{file_path}" as it is outside the permitted working directory'
 
         # 4. Check if it is a regular file
-        if not os.path.isfile(abs_file_path):
+        try:
+            st = os.stat(abs_file_path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             return f'Error: File not found or is not a regular file: "{file_path}"'
 
-        # 5. Read the file content
-        with open(abs_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # 5. Read the file content, reusing the cached read if the file is unchanged
+        cached = _FILE_CACHE.get(abs_file_path)
+        if cached is not None and cached[0] == _stat_key(st):
+            _FILE_CACHE.move_to_end(abs_file_path)
+            content, truncated = cached[1], cached[2]
+        else:
+            content, truncated, st = _read_prefix(abs_file_path)
+            _FILE_CACHE[abs_file_path] = (_stat_key(st), content, truncated)
+            if len(_FILE_CACHE) > _FILE_CACHE_MAXSIZE:
+                _FILE_CACHE.popitem(last=False)
 
         # 6. Truncation check
-        if len(content) > MAX_FILE_CHARS:
-            truncated_content = content[:MAX_FILE_CHARS]
+        if truncated:
             message = f'[...File "{file_path}" truncated at {MAX_FILE_CHARS} characters]'
-            return truncated_content + message
+            return content + message
         
         return content
 
@@ -0,0 +1,50 @@
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=512)
+def _realpath_cached(path: str) -> str:
+    """
+    Memoized os.path.realpath for working directories.
+
+    The agent resolves the same handful of working directories on every tool call,
+    so the lstat chain only needs to be walked once per directory. Callers must pass
+    an absolute path so the cache key does not depend on the current directory.
+    Target file paths are deliberately NOT routed through here: they can be created
+    or replaced by symlinks between calls and must be resolved fresh every time.
+    The working directory still has to be a realpath (not just abspath): the target
+    side is symlink-resolved, so an unresolved working directory containing a
+    symlink would fail the containment check for every file beneath it.
+    """
+    return os.path.realpath(path)
+
+
+def _join_path(base: str, path: str) -> str:
+    """
+    Cheap os.path.join for the two-argument case used by the tools.
+
+    The result is always passed through realpath, which normalizes any doubled or
+    trailing separators, so plain concatenation is enough when `path` is relative.
+    """
+    if not base or os.path.isabs(path):
+        return path
+    return f"{base}{os.sep}{path}"
+
+
+def _dir_prefix(directory: str) -> str:
+    """
+    Return `directory` with exactly one trailing separator, for prefix containment checks.
+
+    The separator stops "/repo/calculator2" from matching "/repo/calculator", and
+    os.path.join leaves roots such as "/" or "C:\\" alone instead of doubling them.
+    """
+    return os.path.join(directory, "")
+
+
+def _is_within(path: str, directory: str) -> bool:
+    """
+    True if the resolved `path` is `directory` itself or sits below it.
+
+    Both arguments must already be realpaths.
+    """
+    return path == directory or path.startswith(_dir_prefix(directory))
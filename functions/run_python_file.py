@@ -1,8 +1,14 @@
 import os
 import subprocess
+import sys
 
+from .paths import _is_within, _join_path, _realpath_cached
 
-def run_python_file(working_directory, file_path, args=None):
+# Run scripts with the agent's own interpreter; avoids a PATH lookup per call.
+_PY = sys.executable
+
+
+def run_python_file(working_directory, file_path, args=None, *, _skip_resolve=False):
     """
     Execute a Python file within a restricted working directory.
 
@@ -10,6 +16,8 @@ def run_python_file(working_directory, file_path, args=None):
         working_directory (str): Base directory that bounds execution.
         file_path (str): Relative or absolute path to the Python file.
         args (list, optional): Additional CLI args passed to the script.
+        _skip_resolve (bool): Internal. Set when working_directory is already a
+            realpath (as produced by tool_registry), so it is not resolved again.
 
     Returns:
         str: Formatted stdout/stderr output or an error description.
@@ -17,11 +25,14 @@ def run_python_file(working_directory, file_path, args=None):
     args = args or []
 
     try:
-        intended_full_path = os.path.join(working_directory, file_path)
-        abs_working_dir = os.path.realpath(working_directory)
+        intended_full_path = _join_path(working_directory, file_path)
+        if _skip_resolve:
+            abs_working_dir = working_directory
+        else:
+            abs_working_dir = _realpath_cached(os.path.abspath(working_directory))
         abs_file_path = os.path.realpath(intended_full_path)
 
-        if os.path.commonpath([abs_working_dir, abs_file_path]) != abs_working_dir:
+        if not _is_within(abs_file_path, abs_working_dir):
             return (
                 f'Error: Cannot execute "{file_path}" as it is outside the permitted '
                 "working directory"
@@ -33,30 +44,35 @@ def run_python_file(working_directory, file_path, args=None):
         if not abs_file_path.endswith(".py"):
             return f'Error: "{file_path}" is not a Python file.'
 
-        command = ["python", abs_file_path, *args]
+        command = [_PY, abs_file_path, *args]
         completed_process = subprocess.run(
             command,
             cwd=abs_working_dir,
+            # Have the child write its stdio as UTF-8 so it matches how we decode it.
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
             capture_output=True,
             text=True,
+            encoding="utf-8",
+            errors="replace",
             timeout=30,
         )
 
-        stdout = completed_process.stdout.strip()
-        stderr = completed_process.stderr.strip()
+        # Undecodable output is replaced rather than failing the whole call.
+        # Empty streams (the common case for stderr) are not stripped.
+        stdout_raw = completed_process.stdout
+        stderr_raw = completed_process.stderr
+        stdout = stdout_raw.strip() if stdout_raw else ""
+        stderr = stderr_raw.strip() if stderr_raw else ""
 
         if not stdout and not stderr:
             return "No output produced."
 
-        output_lines = [
-            f"STDOUT: {stdout}" if stdout else "STDOUT:",
-            f"STDERR: {stderr}" if stderr else "STDERR:",
-        ]
-
-        if completed_process.returncode != 0:
-            output_lines.append(f"Process exited with code {completed_process.returncode}")
-
-        return "\n".join(output_lines)
+        returncode = completed_process.returncode
+        return (
+            (f"STDOUT: {stdout}\n" if stdout else "STDOUT:\n")
+            + (f"STDERR: {stderr}" if stderr else "STDERR:")
+            + (f"\nProcess exited with code {returncode}" if returncode else "")
+        )
 
     except Exception as e:
         return f"Error: executing Python file: {e}"
@@ -5,10 +5,13 @@ from xai_sdk.chat import tool
 
 from .get_file_content import get_file_content
 from .get_files_info import get_files_info
+from .paths import _dir_prefix, _join_path, _realpath_cached
 from .run_python_file import run_python_file
 from .write_file import write_file
 
 REPO_ROOT = os.path.realpath(os.getcwd())
+# Containment prefix for _resolve_working_directory, built once at import.
+_REPO_ROOT_PREFIX = _dir_prefix(REPO_ROOT)
 ToolExecutor = Callable[[Dict[str, Any]], str]
 
 
@@ -16,10 +19,13 @@ def _resolve_working_directory(raw_directory: str | None) -> str:
     """
     Normalize the requested working directory so it stays inside the repository.
     """
-    directory = raw_directory or "."
-    candidate = os.path.realpath(directory if os.path.isabs(directory) else os.path.join(REPO_ROOT, directory))
+    # The repository root is the common case and REPO_ROOT is already a realpath.
+    if not raw_directory or raw_directory == ".":
+        return REPO_ROOT
 
-    if os.path.commonpath([REPO_ROOT, candidate]) != REPO_ROOT:
+    candidate = _realpath_cached(_join_path(REPO_ROOT, raw_directory))
+
+    if candidate != REPO_ROOT and not candidate.startswith(_REPO_ROOT_PREFIX):
         raise ValueError("working_directory must remain inside the repository root.")
 
     return candidate
@@ -35,7 +41,7 @@ def _execute_get_file_content(args: Dict[str, Any]) -> str:
     except ValueError as exc:
         return f"Error: {exc}"
 
-    return get_file_content(working_directory, file_path)
+    return get_file_content(working_directory, file_path, _skip_resolve=True)
 
 
 def _execute_get_files_info(args: Dict[str, Any]) -> str:
@@ -45,7 +51,7 @@ def _execute_get_files_info(args: Dict[str, Any]) -> str:
         return f"Error: {exc}"
 
     directory = args.get("directory", ".")
-    return get_files_info(working_directory, directory)
+    return get_files_info(working_directory, directory, _skip_resolve=True)
 
 
 def _execute_write_file(args: Dict[str, Any]) -> str:
@@ -59,7 +65,7 @@ def _execute_write_file(args: Dict[str, Any]) -> str:
     except ValueError as exc:
         return f"Error: {exc}"
 
-    return write_file(working_directory, file_path, content)
+    return write_file(working_directory, file_path, content, _skip_resolve=True)
 
 
 def _execute_run_python_file(args: Dict[str, Any]) -> str:
@@ -84,7 +90,7 @@ def _execute_run_python_file(args: Dict[str, Any]) -> str:
     except ValueError as exc:
         return f"Error: {exc}"
 
-    return run_python_file(working_directory, file_path, tool_args)
+    return run_python_file(working_directory, file_path, tool_args, _skip_resolve=True)
 
 
 TOOL_DEFINITIONS = [
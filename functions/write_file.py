@@ -1,6 +1,9 @@
 import os
 
-def write_file(working_directory, file_path, content):
+from .get_file_content import _evict_cached_content
+from .paths import _is_within, _join_path, _realpath_cached
+
+def write_file(working_directory, file_path, content, *, _skip_resolve=False):
     """
     Writes content to a specific file, enforcing security checks.
     Creates the file if it does not exist, and overwrites existing content.
@@ -9,29 +12,45 @@ def write_file(working_directory, file_path, content):
         working_directory (str): The permitted root directory for file access.
         file_path (str): The relative or absolute path to the file to write.
         content (str): The string content to write to the file.
+        _skip_resolve (bool): Internal. Set when working_directory is already a
+            realpath (as produced by tool_registry), so it is not resolved again.
 
     Returns:
         str: A success message, or an error message if writing fails.
     """
     try:
         # 1. Combine working_directory and file_path to get the intended full path
-        intended_full_path = os.path.join(working_directory, file_path)
+        intended_full_path = _join_path(working_directory, file_path)
 
         # 2. Normalize paths to handle relative paths and symlinks securely
-        abs_working_dir = os.path.realpath(working_directory)
+        if _skip_resolve:
+            abs_working_dir = working_directory
+        else:
+            abs_working_dir = _realpath_cached(os.path.abspath(working_directory))
         abs_file_path = os.path.realpath(intended_full_path) 
 
         # 3. Security Check: Ensure file_path is within working_directory
-        # If the file path is outside the working directory, the common path will be shorter.
-        if not os.path.commonpath([abs_working_dir, abs_file_path]) == abs_working_dir:
+        if not _is_within(abs_file_path, abs_working_dir):
             return f'Error: Cannot write to "{file_path}" as it is outside the permitted working directory'
 
-        # 4. Write the file content (using 'w' to overwrite/create, and 'utf-8')
-        with open(abs_file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # 4. Write the file content (create/truncate, 'utf-8'). Encoding once and writing
+        # the bytes straight to the fd skips the TextIOWrapper/BufferedWriter layers.
+        char_count = len(content)
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(abs_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            # os.write may write fewer bytes than requested for large payloads.
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+        finally:
+            os.close(fd)
+            # A same-size rewrite within the mtime granularity would look unchanged to the
+            # read cache, so drop any cached copy of this file.
+            _evict_cached_content(abs_file_path)
 
         # 5. Success message
-        return f'Successfully wrote to "{file_path}" ({len(content)} characters written)'
+        return f'Successfully wrote to "{file_path}" ({char_count} characters written)'
 
     except Exception as e:
         # 6. Catch any other errors (e.g., permission issues, directory creation issues)
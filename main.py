@@ -16,19 +16,34 @@ You are Grok code, a careful coding agent operating inside this git repository.
 - Keep answers focused, actionable, and grounded in the repository's actual state.
 """.strip()
 
+# Reused for every tool call instead of going through json.loads each time.
+_JSON_DECODER = json.JSONDecoder()
 
-def _handle_tool_call(tool_call):
+
+def _loggable_arguments(arguments):
+    """
+    Return tool arguments safe to repr() into a log line: file contents sent to
+    write_file are replaced by their length.
+    """
+    content = arguments.get("content")
+    if isinstance(content, str):
+        return {**arguments, "content": f"<{len(content)} chars>"}
+    return arguments
+
+
+def _handle_tool_call(tool_call, verbose=False):
     """
     Execute a requested tool call and return a tuple of (result_text, log_summary).
+    The arguments are only formatted into the summary in verbose mode.
     """
     tool_name = tool_call.function.name
     executor = TOOL_EXECUTORS.get(tool_name)
     if executor is None:
         return f'Error: Unknown tool "{tool_name}".', f'TOOL_CALL {tool_name} FAILED: unknown tool'
 
-    arguments_raw = tool_call.function.arguments or "{}"
+    arguments_raw = tool_call.function.arguments
     try:
-        arguments = json.loads(arguments_raw) if arguments_raw else {}
+        arguments = _JSON_DECODER.decode(arguments_raw) if arguments_raw and arguments_raw != "{}" else {}
     except json.JSONDecodeError as exc:
         return (
             f'Error: Could not parse arguments for tool "{tool_name}": {exc}',
@@ -37,7 +52,10 @@ def _handle_tool_call(tool_call):
 
     try:
         result = executor(arguments)
-        summary = f"TOOL_CALL {tool_name} ARGS {arguments!r}"
+        if verbose:
+            summary = f"TOOL_CALL {tool_name} ARGS {_loggable_arguments(arguments)!r}"
+        else:
+            summary = f"TOOL_CALL {tool_name}"
         return result, summary
     except Exception as exc:
         return f'Error: Tool "{tool_name}" failed: {exc}', f"TOOL_CALL {tool_name} FAILED: {exc}"
@@ -49,8 +67,11 @@ load_dotenv()
 api_key = os.environ.get("BOOT_DEV_GROK_API_KEY")
 
 try:
+    argv = sys.argv
+    argc = len(argv)
+
     # --- Check for CLI argument before proceeding ---
-    if len(sys.argv) < 2:
+    if argc < 2:
         # Print the usage message to stderr (good practice for CLI errors)
         sys.stderr.write("Error: Missing CLI argument.\n")
         # FIX: Ensure usage message includes the optional --verbose flag
@@ -59,11 +80,11 @@ try:
         sys.exit(1)
 
     # --- Check for --verbose flag ---
-    # The flag will be the third argument (index 2) if it exists.
-    is_verbose = (len(sys.argv) == 3 and sys.argv[2] == "--verbose")
+    # The flag may appear anywhere after the prompt (index 2 onwards).
+    is_verbose = argc >= 3 and "--verbose" in argv[2:]
 
     # Store the argument for clarity, now that we know it exists
-    user_query = sys.argv[1]
+    user_query = argv[1]
 
     # 1. Check for API key presence and initialize the Client
     if not api_key:
@@ -100,7 +121,7 @@ try:
 
         chat.append(response)
         for tool_call in response.tool_calls:
-            tool_response_text, log_summary = _handle_tool_call(tool_call)
+            tool_response_text, log_summary = _handle_tool_call(tool_call, is_verbose)
             tool_call_logs.append(log_summary)
             chat.append(tool_result(tool_response_text))
     